@@ -1,11 +1,19 @@
 import streamlit as st
 import snowflake.connector
+from snowflake.connector.errors import OperationalError, ProgrammingError
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from dotenv import load_dotenv
+import math
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from html import escape
 
 # Page config
 st.set_page_config(
@@ -17,71 +25,318 @@ st.set_page_config(
 # Load environment variables
 load_dotenv()
 
-# Create Snowflake connection
+# Snowflake connection pool
+class SnowflakePool:
+    """Bounded pool of Snowflake connections, opened lazily on demand"""
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._idle = queue.Queue(maxsize=maxsize)
+        # One slot per connection that may be checked out at once; a slot is
+        # freed whether its connection is returned or discarded, so waiters
+        # can always open a replacement once Snowflake recovers
+        self._slots = threading.BoundedSemaphore(maxsize)
+
+    def _connect(self):
+        return snowflake.connector.connect(
+            account=os.getenv('SNOWFLAKE_ACCOUNT'),
+            user=os.getenv('SNOWFLAKE_USER'),
+            password=os.getenv('SNOWFLAKE_PASSWORD'),
+            warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
+            database=os.getenv('SNOWFLAKE_DATABASE'),
+            schema=os.getenv('SNOWFLAKE_SCHEMA'),
+            # Download result chunks over more parallel fetches and keep idle
+            # pooled sessions from expiring between dashboard loads
+            client_prefetch_threads=8,
+            client_session_keep_alive=True,
+            session_parameters={
+                'PYTHON_CONNECTOR_QUERY_RESULT_FORMAT': 'ARROW'
+            }
+        )
+
+    def _checkout(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if conn.is_closed():
+                # Dropped while idle; replace it with a fresh connection
+                return self._connect()
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn, healthy):
+        try:
+            if healthy:
+                self._idle.put_nowait(conn)
+            else:
+                conn.close()
+        except Exception:
+            pass
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection, returning it to the pool when done"""
+        conn = self._checkout()
+        healthy = True
+        try:
+            yield conn
+        except (ProgrammingError, OperationalError):
+            # Don't hand a possibly dead session to the next caller
+            healthy = False
+            raise
+        finally:
+            self._checkin(conn, healthy)
+
 @st.cache_resource
-def get_snowflake_connection():
-    """Create and cache Snowflake connection"""
-    return snowflake.connector.connect(
-        account=os.getenv('SNOWFLAKE_ACCOUNT'),
-        user=os.getenv('SNOWFLAKE_USER'),
-        password=os.getenv('SNOWFLAKE_PASSWORD'),
-        warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
-        database=os.getenv('SNOWFLAKE_DATABASE'),
-        schema=os.getenv('SNOWFLAKE_SCHEMA')
-    )
+def get_snowflake_pool():
+    """Create and cache the Snowflake connection pool"""
+    return SnowflakePool(maxsize=8)
 
-# Query functions
-@st.cache_data(ttl=300)
-def get_supplier_risk_scores():
-    """Fetch supplier risk scores from view"""
-    conn = get_snowflake_connection()
-    query = "SELECT * FROM V_SUPPLIER_RISK_SCORE ORDER BY AVG_SENTIMENT_SCORE ASC"
-    df = pd.read_sql(query, conn)
-    return df
+# Dashboard queries (headline metrics, trend and categories come from the
+# summary tables refreshed by the task in sql/dashboard_summary.sql)
+TOP_METRICS_QUERY = "SELECT * FROM DASHBOARD_SUMMARY"
 
-@st.cache_data(ttl=300)
-def get_recent_alerts():
-    """Fetch recent negative communications"""
-    conn = get_snowflake_connection()
-    query = "SELECT * FROM V_RECENT_ALERTS LIMIT 10"
-    df = pd.read_sql(query, conn)
-    return df
+RISK_SCORES_QUERY = """
+    SELECT * FROM V_SUPPLIER_RISK_SCORE
+    ORDER BY AVG_SENTIMENT_SCORE ASC, SUPPLIER_ID
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+# Only alerts from the last ALERT_WINDOW_DAYS days are shown, which lets
+# Snowflake prune old micro-partitions instead of scanning the whole view
+ALERT_WINDOW_DAYS = 7
 
-@st.cache_data(ttl=300)
-def get_sentiment_trend():
-    """Get sentiment trend over time"""
-    conn = get_snowflake_connection()
-    query = """
+RECENT_ALERTS_QUERY = """
+    SELECT * FROM V_RECENT_ALERTS
+    WHERE COMMUNICATION_DATE >= DATEADD('day', -%(alert_days)s, CURRENT_DATE())
+    ORDER BY COMMUNICATION_DATE DESC
+    LIMIT 10
+"""
+
+CATEGORY_ANALYSIS_QUERY = """
+    SELECT * FROM DASHBOARD_CATEGORY_SUMMARY
+    ORDER BY AVG_SENTIMENT ASC
+"""
+
+# Granularities offered for the sentiment trend, finest first
+TREND_BUCKETS = ['day', 'week', 'month']
+
+def sentiment_trend_query(bucket='day'):
+    """Build the sentiment trend query, bucketed server-side"""
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"Unsupported trend bucket: {bucket}")
+    return f"""
     SELECT 
-        DATE_TRUNC('day', sc.COMMUNICATION_DATE) as DATE,
-        AVG(sa.SENTIMENT_SCORE) as AVG_SENTIMENT,
-        COUNT(*) as COMM_COUNT
-    FROM SUPPLIER_COMMUNICATIONS sc
-    JOIN SENTIMENT_ANALYSIS sa ON sc.COMM_ID = sa.COMM_ID
-    GROUP BY DATE_TRUNC('day', sc.COMMUNICATION_DATE)
+        DATE_TRUNC('{bucket}', COMM_DATE) as DATE,
+        SUM(SENTIMENT_SUM) / NULLIF(SUM(SCORED_COUNT), 0) as AVG_SENTIMENT,
+        SUM(COMM_COUNT) as COMM_COUNT
+    FROM DASHBOARD_SENTIMENT_DAILY
+    GROUP BY DATE_TRUNC('{bucket}', COMM_DATE)
     ORDER BY DATE
-    """
-    df = pd.read_sql(query, conn)
-    return df
+"""
 
-@st.cache_data(ttl=300)
-def get_category_analysis():
-    """Get risk by supplier category"""
-    conn = get_snowflake_connection()
-    query = """
-    SELECT 
-        s.CATEGORY,
-        COUNT(DISTINCT s.SUPPLIER_ID) as SUPPLIER_COUNT,
-        AVG(sa.SENTIMENT_SCORE) as AVG_SENTIMENT,
-        SUM(CASE WHEN sa.SENTIMENT_LABEL = 'NEGATIVE' THEN 1 ELSE 0 END) as NEGATIVE_COUNT
-    FROM SUPPLIERS s
-    JOIN SENTIMENT_ANALYSIS sa ON s.SUPPLIER_ID = sa.SUPPLIER_ID
-    GROUP BY s.CATEGORY
-    ORDER BY AVG_SENTIMENT ASC
-    """
-    df = pd.read_sql(query, conn)
+# Rows per page of the supplier risk table
+RISK_PAGE_SIZE = 50
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['RISK_CATEGORY', 'CATEGORY', 'SOURCE_TYPE']
+
+# Query functions
+def shrink_dataframe(df):
+    """Downcast numeric columns and categorize labels to cut memory"""
+    for col in df.select_dtypes('float64'):
+        df[col] = df[col].astype('float32')
+    for col in df.select_dtypes('int64'):
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('category')
     return df
 
+def run_batch(queries, params=None):
+    """Run several queries in one multi-statement request, one DataFrame each"""
+    with get_snowflake_pool().acquire() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                ";\n".join(queries), params, num_statements=len(queries)
+            )
+            frames = [cur.fetch_pandas_all()]
+            while cur.nextset():
+                frames.append(cur.fetch_pandas_all())
+    return frames
+
+# LAST_ALTERED moves on any DML, so every table the dashboard reads from
+# (directly or through its views) gets a change marker
+DATA_VERSION_QUERY = """
+    SELECT
+        MAX(IFF(TABLE_NAME = 'SUPPLIER_COMMUNICATIONS', LAST_ALTERED, NULL)) as COMMUNICATIONS_ALTERED,
+        MAX(IFF(TABLE_NAME = 'SENTIMENT_ANALYSIS', LAST_ALTERED, NULL)) as SENTIMENT_ALTERED,
+        MAX(IFF(TABLE_NAME = 'SUPPLIERS', LAST_ALTERED, NULL)) as SUPPLIERS_ALTERED,
+        (SELECT MAX(SOURCE_UPDATED_AT) FROM DASHBOARD_SUMMARY) as SUMMARY_UPDATED_AT,
+        CURRENT_DATE() as AS_OF_DATE
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+        AND TABLE_NAME IN ('SUPPLIER_COMMUNICATIONS', 'SENTIMENT_ANALYSIS', 'SUPPLIERS')
+"""
+
+# Upper bound on how stale a cached section can get if a change is missed
+DATA_MAX_AGE = 300
+
+@st.cache_data(ttl=30)
+def _probe_version():
+    """Cheap fingerprint of the source and summary data, checked every 30s"""
+    df = run_batch([DATA_VERSION_QUERY])[0]
+    return tuple(df.iloc[0])
+
+# ``version`` (from _probe_version) is part of the cache key, so the batch
+# re-runs as soon as upstream data or the alert window's date changes; the
+# TTL is only a backstop
+@st.cache_data(ttl=DATA_MAX_AGE, max_entries=32)
+def get_dashboard_data(version, risk_page=1):
+    """Fetch every dashboard section except the trend in a single round-trip"""
+    sections = {
+        'top_metrics': TOP_METRICS_QUERY,
+        'risk_scores': RISK_SCORES_QUERY,
+        'alerts': RECENT_ALERTS_QUERY,
+        'category_data': CATEGORY_ANALYSIS_QUERY
+    }
+    params = {
+        'limit': RISK_PAGE_SIZE,
+        'offset': (risk_page - 1) * RISK_PAGE_SIZE,
+        'alert_days': ALERT_WINDOW_DAYS
+    }
+    frames = run_batch(list(sections.values()), params)
+    return dict(zip(sections, map(shrink_dataframe, frames)))
+
+# Fetched on its own so changing the trend granularity doesn't re-run the
+# rest of the dashboard batch
+@st.cache_data(ttl=DATA_MAX_AGE, max_entries=32)
+def get_sentiment_trend(version, bucket='day'):
+    """Fetch the sentiment trend at one granularity"""
+    df = run_batch([sentiment_trend_query(bucket)])[0]
+    return shrink_dataframe(df)
+
+# Chart builders (cached as plain figure dicts so reruns skip rebuilding)
+# Enough figures for a few data versions, buckets and pages; older ones are evicted
+FIGURE_CACHE_ENTRIES = 16
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def build_pie_fig(risk_dist):
+    """Risk distribution pie chart"""
+    fig_pie = px.pie(
+        values=risk_dist.values,
+        names=risk_dist.index,
+        color=risk_dist.index,
+        color_discrete_map={
+            'HIGH_RISK': '#ff6b6b',
+            'MEDIUM_RISK': '#ffd93d',
+            'LOW_RISK': '#6bcf7f'
+        }
+    )
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    
+    return fig_pie.to_dict()
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def build_trend_fig(trend_data):
+    """Sentiment trend line with threshold markers"""
+    fig_trend = go.Figure()
+    
+    fig_trend.add_trace(go.Scattergl(
+        x=trend_data['DATE'],
+        y=trend_data['AVG_SENTIMENT'],
+        mode='lines+markers',
+        name='Avg Sentiment',
+        line=dict(color='#4ecdc4', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig_trend.add_hline(y=0, line_dash="dash", line_color="gray", 
+                       annotation_text="Neutral")
+    fig_trend.add_hline(y=-0.3, line_dash="dash", line_color="red", 
+                       annotation_text="Negative Threshold")
+    fig_trend.add_hline(y=0.3, line_dash="dash", line_color="green", 
+                       annotation_text="Positive Threshold")
+    
+    fig_trend.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Sentiment Score",
+        hovermode='x unified',
+        height=400
+    )
+    
+    return fig_trend.to_dict()
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def build_category_fig(category_data):
+    """Average sentiment and negative communications by supplier category"""
+    fig_cat = make_subplots(
+        rows=1,
+        cols=2,
+        subplot_titles=("Risk by Category", "Negative Communications by Category")
+    )
+    
+    fig_cat.add_bar(
+        x=category_data['CATEGORY'],
+        y=category_data['AVG_SENTIMENT'],
+        marker=dict(
+            color=category_data['AVG_SENTIMENT'],
+            colorscale=['red', 'yellow', 'green']
+        ),
+        text=category_data['AVG_SENTIMENT'],
+        texttemplate='%{text:.2f}',
+        textposition='outside',
+        row=1,
+        col=1
+    )
+    fig_cat.add_bar(
+        x=category_data['CATEGORY'],
+        y=category_data['NEGATIVE_COUNT'],
+        marker=dict(
+            color=category_data['NEGATIVE_COUNT'],
+            colorscale='Reds'
+        ),
+        text=category_data['NEGATIVE_COUNT'],
+        textposition='outside',
+        row=1,
+        col=2
+    )
+    
+    fig_cat.update_layout(showlegend=False, height=400)
+    
+    return fig_cat.to_dict()
+
+# Dashboard sections
+def show_connection_error(e):
+    """Explain a failed Snowflake call instead of showing a traceback"""
+    st.error(f"❌ Error connecting to Snowflake: {str(e)}")
+    st.info("Please check your .env file and ensure Snowflake credentials are correct.")
+
+@st.fragment
+def render_sentiment_trend():
+    """Sentiment trend chart; changing its granularity only reruns this section"""
+    st.subheader("📈 Sentiment Trend Over Time")
+    trend_bucket = st.select_slider(
+        "Granularity",
+        options=TREND_BUCKETS,
+        key='trend_bucket',
+        help="Coarser buckets keep long histories light to query and plot"
+    )
+    
+    # Fragment-only reruns don't pass through main()'s error handling
+    try:
+        trend_data = get_sentiment_trend(_probe_version(), trend_bucket)
+        st.plotly_chart(build_trend_fig(trend_data), use_container_width=True)
+    except Exception as e:
+        show_connection_error(e)
+
 # Main app
 def main():
     # Header
@@ -91,163 +346,157 @@ def main():
     
     # Fetch data
     try:
-        risk_scores = get_supplier_risk_scores()
-        alerts = get_recent_alerts()
-        trend_data = get_sentiment_trend()
-        category_data = get_category_analysis()
+        # Widgets further down the page feed into the queries, so read
+        # their last value from session state before fetching
+        risk_page = max(1, int(st.session_state.get('risk_page', 1)))
+        version = _probe_version()
         
-        # Top metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            high_risk_count = len(risk_scores[risk_scores['RISK_CATEGORY'] == 'HIGH_RISK'])
-            st.metric("🔴 High Risk Suppliers", high_risk_count)
-        
-        with col2:
-            avg_sentiment = risk_scores['AVG_SENTIMENT_SCORE'].mean()
-            st.metric("📊 Avg Sentiment Score", f"{avg_sentiment:.2f}")
-        
-        with col3:
-            total_comms = risk_scores['TOTAL_COMMUNICATIONS'].sum()
-            st.metric("📧 Total Communications", int(total_comms))
-        
-        with col4:
-            negative_comms = risk_scores['NEGATIVE_COUNT'].sum()
-            st.metric("⚠️ Negative Alerts", int(negative_comms))
-        
-        st.markdown("---")
+        data = get_dashboard_data(version, risk_page)
+        if data['top_metrics'].empty:
+            # REFRESH_DASHBOARD hasn't completed a run yet (or is suspended)
+            st.warning(
+                "⏳ Dashboard summaries have not been built yet. Run "
+                "`EXECUTE TASK REFRESH_DASHBOARD` (and `ALTER TASK "
+                "REFRESH_DASHBOARD RESUME` if it is suspended) from "
+                "sql/dashboard_summary.sql, then reload this page."
+            )
+            return
+        top_metrics = data['top_metrics'].iloc[0]
+        total_pages = max(
+            1, math.ceil(top_metrics['SUPPLIER_COUNT'] / RISK_PAGE_SIZE)
+        )
+        if risk_page > total_pages:
+            # Supplier count shrank under a stale page; fall back to the last one
+            risk_page = total_pages
+            st.session_state['risk_page'] = risk_page
+            data = get_dashboard_data(version, risk_page)
+        risk_scores = data['risk_scores']
+        alerts = data['alerts']
+        category_data = data['category_data']
         
-        # Two column layout
-        col_left, col_right = st.columns([2, 1])
+        # Tabs keep below-the-fold sections out of the initial view
+        tab_overview, tab_trend, tab_categories, tab_alerts = st.tabs(
+            ["Overview", "Trend", "Categories", "Alerts"]
+        )
         
-        with col_left:
-            # Supplier risk table
-            st.subheader("📋 Supplier Risk Scores")
+        with tab_overview:
+            # Top metrics
+            col1, col2, col3, col4 = st.columns(4)
             
-            # Color code risk categories
-            def color_risk(val):
-                if val == 'HIGH_RISK':
-                    return 'background-color: #ffcccc'
-                elif val == 'MEDIUM_RISK':
-                    return 'background-color: #fff4cc'
-                else:
-                    return 'background-color: #ccffcc'
+            with col1:
+                high_risk_count = int(top_metrics['HIGH_RISK_COUNT'])
+                st.metric("🔴 High Risk Suppliers", high_risk_count)
             
-            styled_df = risk_scores.style.applymap(
-                color_risk, 
-                subset=['RISK_CATEGORY']
-            ).format({
-                'AVG_SENTIMENT_SCORE': '{:.3f}'
-            })
+            with col2:
+                avg_sentiment = top_metrics['AVG_SENTIMENT_SCORE']
+                # AVG() is NULL while there are no suppliers yet
+                st.metric(
+                    "📊 Avg Sentiment Score",
+                    f"{avg_sentiment:.2f}" if pd.notna(avg_sentiment) else "—"
+                )
             
-            st.dataframe(styled_df, use_container_width=True, height=400)
-        
-        with col_right:
-            # Risk distribution pie chart
-            st.subheader("🎯 Risk Distribution")
-            risk_dist = risk_scores['RISK_CATEGORY'].value_counts()
+            with col3:
+                total_comms = top_metrics['TOTAL_COMMUNICATIONS']
+                st.metric("📧 Total Communications", int(total_comms))
             
-            fig_pie = px.pie(
-                values=risk_dist.values,
-                names=risk_dist.index,
-                color=risk_dist.index,
-                color_discrete_map={
-                    'HIGH_RISK': '#ff6b6b',
-                    'MEDIUM_RISK': '#ffd93d',
-                    'LOW_RISK': '#6bcf7f'
-                }
-            )
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Sentiment trend chart
-        st.subheader("📈 Sentiment Trend Over Time")
-        fig_trend = go.Figure()
-        
-        fig_trend.add_trace(go.Scatter(
-            x=trend_data['DATE'],
-            y=trend_data['AVG_SENTIMENT'],
-            mode='lines+markers',
-            name='Avg Sentiment',
-            line=dict(color='#4ecdc4', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_trend.add_hline(y=0, line_dash="dash", line_color="gray", 
-                           annotation_text="Neutral")
-        fig_trend.add_hline(y=-0.3, line_dash="dash", line_color="red", 
-                           annotation_text="Negative Threshold")
-        fig_trend.add_hline(y=0.3, line_dash="dash", line_color="green", 
-                           annotation_text="Positive Threshold")
-        
-        fig_trend.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Sentiment Score",
-            hovermode='x unified',
-            height=400
-        )
-        
-        st.plotly_chart(fig_trend, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Category analysis
-        col_cat1, col_cat2 = st.columns(2)
-        
-        with col_cat1:
-            st.subheader("📦 Risk by Category")
-            fig_cat = px.bar(
-                category_data,
-                x='CATEGORY',
-                y='AVG_SENTIMENT',
-                color='AVG_SENTIMENT',
-                color_continuous_scale=['red', 'yellow', 'green'],
-                text='AVG_SENTIMENT'
-            )
-            fig_cat.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-            fig_cat.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig_cat, use_container_width=True)
-        
-        with col_cat2:
-            st.subheader("⚠️ Negative Communications by Category")
-            fig_neg = px.bar(
-                category_data,
-                x='CATEGORY',
-                y='NEGATIVE_COUNT',
-                color='NEGATIVE_COUNT',
-                color_continuous_scale='Reds',
-                text='NEGATIVE_COUNT'
-            )
-            fig_neg.update_traces(textposition='outside')
-            fig_neg.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig_neg, use_container_width=True)
+            with col4:
+                negative_comms = top_metrics['NEGATIVE_COUNT']
+                st.metric("⚠️ Negative Alerts", int(negative_comms))
+            
+            st.markdown("---")
+            
+            # Two column layout
+            col_left, col_right = st.columns([2, 1])
+            
+            with col_left:
+                # Supplier risk table
+                st.subheader("📋 Supplier Risk Scores")
+                
+                # Color code risk categories (one vectorized pass per column)
+                def color_risk(col):
+                    return np.select(
+                        [col.eq('HIGH_RISK'), col.eq('MEDIUM_RISK')],
+                        ['background-color: #ffcccc', 'background-color: #fff4cc'],
+                        default='background-color: #ccffcc'
+                    )
+                
+                styled_df = risk_scores.style.apply(
+                    color_risk, 
+                    subset=['RISK_CATEGORY']
+                )
+                
+                # Number formatting happens client-side via column_config
+                st.dataframe(
+                    styled_df,
+                    column_config={
+                        'AVG_SENTIMENT_SCORE': st.column_config.NumberColumn(
+                            format="%.3f"
+                        )
+                    },
+                    use_container_width=True,
+                    height=400
+                )
+                st.number_input(
+                    "Page",
+                    min_value=1,
+                    max_value=total_pages,
+                    step=1,
+                    key='risk_page'
+                )
+                st.caption(
+                    f"Page {risk_page} of {total_pages} · "
+                    f"{RISK_PAGE_SIZE} suppliers per page"
+                )
+            
+            with col_right:
+                # Risk distribution pie chart
+                st.subheader("🎯 Risk Distribution")
+                risk_dist = pd.Series({
+                    category: int(top_metrics[f'{category}_COUNT'])
+                    for category in ('HIGH_RISK', 'MEDIUM_RISK', 'LOW_RISK')
+                })
+                
+                st.plotly_chart(build_pie_fig(risk_dist), use_container_width=True)
         
-        st.markdown("---")
+        with tab_trend:
+            render_sentiment_trend()
         
-        # Recent alerts section
-        st.subheader("🚨 Recent Negative Alerts")
+        with tab_categories:
+            # Category analysis (both charts share one figure and layout pass)
+            st.subheader("📦 Category Analysis")
+            st.plotly_chart(build_category_fig(category_data), use_container_width=True)
         
-        for idx, row in alerts.iterrows():
-            with st.expander(f"⚠️ {row['SUPPLIER_NAME']} - {row['SUBJECT']} ({row['COMMUNICATION_DATE'].strftime('%Y-%m-%d')})"):
-                col_a, col_b = st.columns([1, 3])
-                
-                with col_a:
-                    st.metric("Sentiment Score", f"{row['SENTIMENT_SCORE']:.3f}")
-                    st.write(f"**Source:** {row['SOURCE_TYPE']}")
-                
-                with col_b:
-                    st.write("**Summary:**")
-                    st.write(row['KEY_PHRASES'])
+        with tab_alerts:
+            # Recent alerts section
+            st.subheader("🚨 Recent Negative Alerts")
+            st.caption(f"Latest alerts from the past {ALERT_WINDOW_DAYS} days")
+            
+            if alerts.empty:
+                st.info(f"No negative alerts in the past {ALERT_WINDOW_DAYS} days")
+            else:
+                # One native <details> block per alert: expanding them is handled
+                # by the browser and doesn't create widgets or trigger reruns
+                alert_html = "\n".join(
+                    f"<details><summary>⚠️ {escape(str(row.SUPPLIER_NAME))} - "
+                    f"{escape(str(row.SUBJECT))} "
+                    f"({row.COMMUNICATION_DATE.strftime('%Y-%m-%d')})</summary>"
+                    f"<p><b>Sentiment Score:</b> {row.SENTIMENT_SCORE:.3f}<br>"
+                    f"<b>Source:</b> {escape(str(row.SOURCE_TYPE))}</p>"
+                    f"<p><b>Summary:</b><br>{escape(str(row.KEY_PHRASES))}</p>"
+                    f"</details>"
+                    for row in alerts.itertuples(index=False)
+                )
+                st.markdown(alert_html, unsafe_allow_html=True)
         
         # Footer
         st.markdown("---")
-        st.markdown("*Built with Snowflake Cortex ML | Data refreshes every 5 minutes*")
+        st.markdown(
+            "*Built with Snowflake Cortex ML | Data reloads when Snowflake "
+            "changes (checked every 30 seconds); summaries rebuild every 5 minutes*"
+        )
         
     except Exception as e:
-        st.error(f"❌ Error connecting to Snowflake: {str(e)}")
-        st.info("Please check your .env file and ensure Snowflake credentials are correct.")
+        show_connection_error(e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
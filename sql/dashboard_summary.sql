@@ -0,0 +1,92 @@
+-- Pre-aggregated tables read by the dashboard (app.py).
+--
+-- Run once in the dashboard's database and schema. The REFRESH_DASHBOARD
+-- task rebuilds the summaries every 5 minutes, so page loads read a few
+-- small tables instead of aggregating the communication history each time.
+
+CREATE TABLE IF NOT EXISTS DASHBOARD_SUMMARY (
+    HIGH_RISK_COUNT NUMBER,
+    MEDIUM_RISK_COUNT NUMBER,
+    LOW_RISK_COUNT NUMBER,
+    AVG_SENTIMENT_SCORE FLOAT,
+    TOTAL_COMMUNICATIONS NUMBER,
+    NEGATIVE_COUNT NUMBER,
+    SUPPLIER_COUNT NUMBER,
+    REFRESHED_AT TIMESTAMP_LTZ,
+    -- Latest LAST_ALTERED of the source tables the summary was built from;
+    -- the app uses it to tell when its cached summaries are out of date
+    SOURCE_UPDATED_AT TIMESTAMP_LTZ
+);
+
+-- Daily sums rather than averages, so the app can roll them up to
+-- weeks or months without averaging averages
+CREATE TABLE IF NOT EXISTS DASHBOARD_SENTIMENT_DAILY (
+    COMM_DATE TIMESTAMP_NTZ,
+    SENTIMENT_SUM FLOAT,
+    SCORED_COUNT NUMBER,
+    COMM_COUNT NUMBER
+);
+
+CREATE TABLE IF NOT EXISTS DASHBOARD_CATEGORY_SUMMARY (
+    CATEGORY VARCHAR,
+    SUPPLIER_COUNT NUMBER,
+    AVG_SENTIMENT FLOAT,
+    NEGATIVE_COUNT NUMBER
+);
+
+CREATE OR REPLACE TASK REFRESH_DASHBOARD
+    USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE = 'XSMALL'
+    SCHEDULE = '5 MINUTE'
+AS
+EXECUTE IMMEDIATE $$
+DECLARE
+    -- Captured before any table is rebuilt, so the stamp never claims
+    -- changes newer than the rows written below
+    source_version TIMESTAMP_LTZ;
+BEGIN
+    SELECT MAX(LAST_ALTERED) INTO :source_version
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+        AND TABLE_NAME IN ('SUPPLIER_COMMUNICATIONS', 'SENTIMENT_ANALYSIS', 'SUPPLIERS');
+
+    INSERT OVERWRITE INTO DASHBOARD_SENTIMENT_DAILY
+    SELECT
+        DATE_TRUNC('day', sc.COMMUNICATION_DATE),
+        SUM(sa.SENTIMENT_SCORE),
+        COUNT(sa.SENTIMENT_SCORE),
+        COUNT(*)
+    FROM SUPPLIER_COMMUNICATIONS sc
+    JOIN SENTIMENT_ANALYSIS sa ON sc.COMM_ID = sa.COMM_ID
+    GROUP BY DATE_TRUNC('day', sc.COMMUNICATION_DATE);
+
+    INSERT OVERWRITE INTO DASHBOARD_CATEGORY_SUMMARY
+    SELECT
+        s.CATEGORY,
+        COUNT(DISTINCT s.SUPPLIER_ID),
+        AVG(sa.SENTIMENT_SCORE),
+        SUM(CASE WHEN sa.SENTIMENT_LABEL = 'NEGATIVE' THEN 1 ELSE 0 END)
+    FROM SUPPLIERS s
+    JOIN SENTIMENT_ANALYSIS sa ON s.SUPPLIER_ID = sa.SUPPLIER_ID
+    GROUP BY s.CATEGORY;
+
+    -- Written last: its SOURCE_UPDATED_AT is the version the app keys its
+    -- cache on, so it must only move once the other summaries are in place
+    INSERT OVERWRITE INTO DASHBOARD_SUMMARY
+    SELECT
+        COUNT_IF(RISK_CATEGORY = 'HIGH_RISK'),
+        COUNT_IF(RISK_CATEGORY = 'MEDIUM_RISK'),
+        COUNT_IF(RISK_CATEGORY = 'LOW_RISK'),
+        AVG(AVG_SENTIMENT_SCORE),
+        COALESCE(SUM(TOTAL_COMMUNICATIONS), 0),
+        COALESCE(SUM(NEGATIVE_COUNT), 0),
+        COUNT(*),
+        CURRENT_TIMESTAMP(),
+        :source_version
+    FROM V_SUPPLIER_RISK_SCORE;
+END;
+$$;
+
+ALTER TASK REFRESH_DASHBOARD RESUME;
+
+-- Populate the summaries now rather than waiting for the first schedule
+EXECUTE TASK REFRESH_DASHBOARD;
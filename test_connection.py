@@ -1,27 +1,36 @@
 import snowflake.connector
 from dotenv import load_dotenv
 import os
+import time
 
 # Load environment variables
 load_dotenv()
 
-# Create connection
-conn = snowflake.connector.connect(
+# Create connection (closed automatically, even if the query fails)
+with snowflake.connector.connect(
     account=os.getenv('SNOWFLAKE_ACCOUNT'),
     user=os.getenv('SNOWFLAKE_USER'),
     password=os.getenv('SNOWFLAKE_PASSWORD'),
     warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
     database=os.getenv('SNOWFLAKE_DATABASE'),
     schema=os.getenv('SNOWFLAKE_SCHEMA')
-)
+) as conn, conn.cursor() as cursor:
+    # Test query (row count is read from table metadata, not a table scan),
+    # submitted without blocking so other startup work can overlap it
+    cursor.execute_async(
+        "SELECT ROW_COUNT FROM INFORMATION_SCHEMA.TABLES "
+        "WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME = 'SUPPLIERS'"
+    )
+    query_id = cursor.sfqid
 
-print("✅ Connected to Snowflake successfully!")
+    print("✅ Connected to Snowflake successfully!")
 
-# Test query
-cursor = conn.cursor()
-cursor.execute("SELECT COUNT(*) FROM SUPPLIERS")
-result = cursor.fetchone()
-print(f"📊 Number of suppliers in database: {result[0]}")
-
-cursor.close()
-conn.close()
\ No newline at end of file
+    # Wait for the query (raises if it failed), then fetch its result
+    while conn.is_still_running(conn.get_query_status_throw_if_error(query_id)):
+        time.sleep(0.05)
+    cursor.get_results_from_sfqid(query_id)
+    result = cursor.fetchone()
+    if result is None:
+        print(f"❌ SUPPLIERS table not found in schema {conn.database}.{conn.schema}")
+    else:
+        print(f"📊 Number of suppliers in database: {result[0]}")